@@ -1,21 +1,31 @@
+import asyncio
 import base64
+import contextlib
 import datetime
 import logging
+import logging.handlers
 import os
+import queue
+import secrets
 import sqlite3
+import sys
+import threading
 import time
-import uuid
-from email.message import EmailMessage
+from email.header import Header
 from typing import Optional
 
+import anyio.to_thread
+import google_auth_httplib2
+import httplib2
+import httpx
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Request
 from fastapi.responses import Response
-import requests
 from google.auth.transport.requests import Request as GoogleRequest
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from pydantic import BaseModel, EmailStr
 
 DB_FILE = "email_assistant.db"
@@ -23,11 +33,56 @@ DB_FILE = "email_assistant.db"
 
 load_dotenv()
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Route log records through a queue so formatting and the write() syscall
+# happen on the listener thread, not on the event loop or a pixel handler.
+_log_handler = logging.StreamHandler(sys.stderr)
+_log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.QueueHandler(_log_queue)])
 logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Tracked Email System")
 
+
+@app.on_event("startup")
+async def _startup_http_client():
+    # One shared client so logo fetches reuse keep-alive connections
+    # instead of paying a TCP+TLS handshake per pixel hit.
+    app.state.http = httpx.AsyncClient(
+        timeout=5,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+    )
+
+
+@app.on_event("startup")
+async def _startup_open_writer():
+    global _open_queue, _open_writer_task
+    _open_queue = asyncio.Queue()
+    _open_writer_task = asyncio.create_task(_open_writer_loop())
+
+
+@app.on_event("shutdown")
+async def _shutdown_open_writer():
+    if _open_writer_task is not None:
+        _open_writer_task.cancel()
+
+
+@app.on_event("startup")
+def _startup_gmail_service():
+    # Warm the shared credential cache so the first send does not pay for
+    # credential loading (the per-thread service itself is cheap to build).
+    try:
+        get_gmail_service()
+    except Exception as e:
+        logger.warning(f"Gmail service not available at startup (will retry on first send): {e}")
+
+
+@app.on_event("shutdown")
+async def _shutdown_http_client():
+    await app.state.http.aclose()
+
 print("\n" + "="*80)
 print("🚀 TRACKED EMAIL SYSTEM STARTING")
 print("="*80)
@@ -49,6 +104,26 @@ DEFAULT_LOGO_URL = (
 
 SCOPES = ["https://mail.google.com/"]
 
+# The send path is hot once bulk sends land, so everything static about the
+# logo footer is computed once at import: env reads, the static block, and
+# the tracking-URL template (only the per-email params vary).
+TRACKING_BASE = os.getenv("TRACKING_BASE_URL", "").rstrip("/")
+STATIC_LOGO_URL = os.getenv("TRACKING_LOGO_URL", DEFAULT_LOGO_URL)
+
+_LOGO_BLOCK_TMPL = (
+    '<div style="margin-top:20px;text-align:center;">'
+    '<img src="{logo_url}" alt="Zain" '
+    'style="display:block;width:60px;height:auto;margin:0 auto;border-radius:8px;" />'
+    '<p style="margin:8px 0 0 0;font-size:12px;color:#666;font-family:Arial,sans-serif;">'
+    "Sent via Zain</p>"
+    "</div>"
+)
+STATIC_LOGO_BLOCK = _LOGO_BLOCK_TMPL.format(logo_url=STATIC_LOGO_URL)
+TRACKING_URL_TMPL = (
+    TRACKING_BASE + "/app/v1/bulkemail/email-read-receipt/"
+    "?t={t}&eid={eid}&ts={ts}&nc={nc}"
+)
+
 
 def _load_gmail_credentials() -> Credentials:
     """
@@ -75,20 +150,117 @@ def _load_gmail_credentials() -> Credentials:
     return creds
 
 
+_gmail_creds: Optional[Credentials] = None
+_gmail_creds_lock = threading.Lock()
+_gmail_local = threading.local()
+
+
+def _get_gmail_credentials() -> Credentials:
+    """Shared credential cache, reloaded only on expiry."""
+    global _gmail_creds
+    with _gmail_creds_lock:
+        if _gmail_creds is None or _gmail_creds.expired:
+            _gmail_creds = _load_gmail_credentials()
+        return _gmail_creds
+
+
 def get_gmail_service():
-    creds = _load_gmail_credentials()
-    service = build("gmail", "v1", credentials=creds)
-    return service
+    """
+    Return a Gmail service for the calling thread. The credentials (the
+    expensive part: token parsing, refresh round-trips) are cached and
+    shared, but the discovery service sits on an httplib2.Http, which is
+    not thread-safe - and background sends run concurrently in threadpool
+    threads - so each thread gets its own service on its own AuthorizedHttp.
+    """
+    creds = _get_gmail_credentials()
+    if getattr(_gmail_local, "creds", None) is not creds:
+        _gmail_local.service = build(
+            "gmail",
+            "v1",
+            http=google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http()),
+        )
+        _gmail_local.creds = creds
+    return _gmail_local.service
+
+
+def _apply_connection_pragmas(conn: sqlite3.Connection):
+    # Only journal_mode=WAL persists in the database file (set once in
+    # init_tracking_db); everything else is per-connection state and must be
+    # applied to every new connection - in particular synchronous=NORMAL,
+    # without which commits on that connection fall back to a full fsync.
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-65536")
 
 
 def get_connection() -> sqlite3.Connection:
-    return sqlite3.connect(os.path.abspath(DB_FILE))
+    conn = sqlite3.connect(os.path.abspath(DB_FILE))
+    _apply_connection_pragmas(conn)
+    return conn
+
+
+class ConnectionPool:
+    """
+    Dual pool over the tracking database: one dedicated write connection
+    guarded by a lock, plus a small queue of reusable read connections.
+
+    WAL mode allows many readers concurrent with the single writer, so the
+    pixel path no longer pays sqlite3.connect() (and its openat() syscalls
+    on the .db/-wal/-shm files) on every hit.
+    """
+
+    def __init__(self, db_path: str, readers: int = 8):
+        self._db_path = db_path
+        self._write_lock = threading.Lock()
+        self._write_conn = self._connect()
+        self._readers: queue.Queue[sqlite3.Connection] = queue.Queue(maxsize=readers)
+        for _ in range(readers):
+            self._readers.put(self._connect())
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 keeps a per-connection cache of prepared statements keyed
+        # by SQL text; a larger cache plus the module-level SQL constants
+        # below means hot statements are parsed once per connection.
+        conn = sqlite3.connect(self._db_path, check_same_thread=False, cached_statements=256)
+        _apply_connection_pragmas(conn)
+        return conn
+
+    @contextlib.contextmanager
+    def reader(self):
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextlib.contextmanager
+    def writer(self):
+        with self._write_lock:
+            try:
+                yield self._write_conn
+            except BaseException:
+                # The write connection is shared; an exception mid-transaction
+                # (SQLITE_BUSY, disk full, ...) must not leave it inside an
+                # open transaction, or every later writer fails with "cannot
+                # start a transaction within a transaction" and the next
+                # unrelated commit would flush the partial work. rollback()
+                # is a no-op when no transaction is open.
+                self._write_conn.rollback()
+                raise
 
 
 def init_tracking_db():
     conn = get_connection()
     cursor = conn.cursor()
 
+    # WAL + NORMAL sync (per-connection, via _apply_connection_pragmas):
+    # writes append to the WAL instead of doing a full rollback-journal
+    # fsync per commit, and readers no longer block on the writer - pixel
+    # hits and /status reads can overlap. WAL itself sticks to the DB file.
+    cursor.execute("PRAGMA journal_mode=WAL")
+
     cursor.execute(
         """
         CREATE TABLE IF NOT EXISTS tracked_emails (
@@ -125,17 +297,57 @@ def init_tracking_db():
     if "read_count" not in columns:
         cursor.execute("ALTER TABLE tracked_emails ADD COLUMN read_count INTEGER DEFAULT 0")
 
+    # The covering index once built here served a SELECT that no longer
+    # exists; with the aggregate UPDATE rewriting all its non-key columns
+    # per open it was pure write amplification. The implicit UNIQUE index
+    # on tracking_id handles the UPDATE's row lookup, so drop the covering
+    # index from databases that still carry it.
+    cursor.execute("DROP INDEX IF EXISTS idx_tracked_emails_tracking_id_cover")
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_email_opens_tracking_id
+        ON email_opens(tracking_id, opened_at)
+        """
+    )
+
     conn.commit()
     conn.close()
 
 
 init_tracking_db()
 
+pool = ConnectionPool(os.path.abspath(DB_FILE))
+
+# Hot-path SQL as module constants: reusing the identical string maximizes
+# hits in each connection's prepared-statement cache.
+SQL_INSERT_OPEN = """
+    INSERT INTO email_opens (tracking_id, opened_at, user_agent, ip_address)
+    VALUES (?, ?, ?, ?)
+"""
+SQL_UPDATE_TRACKED = """
+    UPDATE tracked_emails
+    SET read_count = COALESCE(read_count, 0) + ?,
+        last_read_at = ?,
+        read_at = COALESCE(read_at, ?),
+        is_read = 1
+    WHERE tracking_id = ?
+    RETURNING read_count
+"""
+SQL_SELECT_TID_BY_EID = "SELECT tracking_id FROM tracked_emails WHERE id = ?"
+
 
 class SendTrackedEmailRequest(BaseModel):
     to: EmailStr
     subject: str
-    html_body: str 
+    html_body: str
+
+
+class BulkSendRequest(BaseModel):
+    emails: list[SendTrackedEmailRequest]
+
+
+# Gmail allows up to 100 calls per batch HTTP request; stay below that.
+GMAIL_MAX_BATCH = 64
 
 
 def _build_email_html(tracking_id: str, email_db_id: int, req: SendTrackedEmailRequest) -> tuple[str, str]:
@@ -149,104 +361,142 @@ def _build_email_html(tracking_id: str, email_db_id: int, req: SendTrackedEmailR
     2. Returns the actual logo image (proxied or hosted)
     """
     base_html = req.html_body.strip()
-    tracking_base = os.getenv("TRACKING_BASE_URL", "").rstrip("/")
-    static_logo_url = os.getenv("TRACKING_LOGO_URL", DEFAULT_LOGO_URL)
 
-    if not tracking_base:
+    if not TRACKING_BASE:
         logger.warning("TRACKING_BASE_URL is empty; sending email WITHOUT tracking")
-        logo_block = (
-            f'<div style="margin-top:20px;text-align:center;">'
-            f'<img src="{static_logo_url}" alt="Zain" '
-            f'style="display:block;width:60px;height:auto;margin:0 auto;border-radius:8px;" />'
-            f'<p style="margin:8px 0 0 0;font-size:12px;color:#666;font-family:Arial,sans-serif;">'
-            f"Sent via Zain</p>"
-            f"</div>"
-        )
-        full_html = base_html + "\n" + logo_block
+        full_html = base_html + "\n" + STATIC_LOGO_BLOCK
         return full_html, full_html
 
-    ts = int(datetime.datetime.utcnow().timestamp() * 1000)
-    nonce = uuid.uuid4().hex
-    tracking_logo_url = (
-        f"{tracking_base}/app/v1/bulkemail/email-read-receipt/"
-        f"?t={tracking_id}&eid={email_db_id}&ts={ts}&nc={nonce}"
+    ts = time.time_ns() // 1_000_000
+    nonce = secrets.token_urlsafe(8)
+    tracking_logo_url = TRACKING_URL_TMPL.format(
+        t=tracking_id, eid=email_db_id, ts=ts, nc=nonce
     )
 
-    logo_block_tracked = (
-        f'<div style="margin-top:20px;text-align:center;">'
-        f'<img src="{tracking_logo_url}" alt="Zain" '
-        f'style="display:block;width:60px;height:auto;margin:0 auto;border-radius:8px;" />'
-        f'<p style="margin:8px 0 0 0;font-size:12px;color:#666;font-family:Arial,sans-serif;">'
-        f"Sent via Zain</p>"
-        f"</div>"
-    )
-
-    logo_block_static = (
-        f'<div style="margin-top:20px;text-align:center;">'
-        f'<img src="{static_logo_url}" alt="Zain" '
-        f'style="display:block;width:60px;height:auto;margin:0 auto;border-radius:8px;" />'
-        f'<p style="margin:8px 0 0 0;font-size:12px;color:#666;font-family:Arial,sans-serif;">'
-        f"Sent via Zain</p>"
-        f"</div>"
-    )
-
-    html_with_tracking = base_html + "\n" + logo_block_tracked
-    html_sanitized = base_html + "\n" + logo_block_static
+    html_with_tracking = base_html + "\n" + _LOGO_BLOCK_TMPL.format(logo_url=tracking_logo_url)
+    html_sanitized = base_html + "\n" + STATIC_LOGO_BLOCK
 
     return html_with_tracking, html_sanitized
 
 
-def _build_raw_message(from_addr: str, to_addr: str, subject: str, html_body: str) -> str:
-    msg = EmailMessage()
-    msg["To"] = to_addr
-    msg["From"] = from_addr
-    msg["Subject"] = subject
-    msg.set_content("This email requires an HTML-capable client.")
-    msg.add_alternative(html_body, subtype="html")
-
-    raw_bytes = msg.as_bytes()
-    raw_b64 = base64.urlsafe_b64encode(raw_bytes).decode("utf-8")
-    return raw_b64
+# Every message has the same fixed shape (From/To/Subject + plain-text
+# fallback + HTML alternative), so the RFC 5322 bytes are assembled from a
+# precomputed template instead of going through EmailMessage, which spends
+# its time on general header folding and encoding this layout never needs.
+_MIME_BOUNDARY = "=_tracked_email_boundary"
+_RAW_TMPL = (
+    "To: %s\r\n"
+    "From: %s\r\n"
+    "Subject: %s\r\n"
+    "MIME-Version: 1.0\r\n"
+    f'Content-Type: multipart/alternative; boundary="{_MIME_BOUNDARY}"\r\n'
+    "\r\n"
+    f"--{_MIME_BOUNDARY}\r\n"
+    "Content-Type: text/plain; charset=utf-8\r\n"
+    "\r\n"
+    "This email requires an HTML-capable client.\r\n"
+    f"--{_MIME_BOUNDARY}\r\n"
+    "Content-Type: text/html; charset=utf-8\r\n"
+    "Content-Transfer-Encoding: 8bit\r\n"
+    "\r\n"
+    "%s\r\n"
+    f"--{_MIME_BOUNDARY}--\r\n"
+)
 
 
-@app.post("/tracked_email/send")
-def send_tracked_email(req: SendTrackedEmailRequest):
+def _build_raw_message(from_addr: str, to_addr: str, subject: str, html_body: str) -> str:
+    # EmailMessage validated header values for us; keep that guarantee here.
+    # A CR/LF smuggled into a header value is header injection (an attacker
+    # adding e.g. "\r\nBcc: ..."), not a use case: reject it in addresses
+    # and collapse free-text subjects onto one line.
+    if "\r" in to_addr or "\n" in to_addr or "\r" in from_addr or "\n" in from_addr:
+        raise ValueError("CR/LF not allowed in email addresses")
+    subject = " ".join(subject.splitlines())
+    # Header handles RFC 2047 encoding for non-ASCII subjects and CRLF
+    # folding for anything near the RFC 5322 998-char line limit.
+    if not subject.isascii() or len(subject) > 900:
+        subject = Header(subject, "utf-8").encode(linesep="\r\n")
+    raw_bytes = (_RAW_TMPL % (to_addr, from_addr, subject, html_body)).encode("utf-8")
+    return base64.urlsafe_b64encode(raw_bytes).decode("utf-8")
+
+
+def _replace_sent_copy(service, gmail_message_id: str, raw_sanitized: str):
     """
-    Send an email via Gmail API with:
-    - Zain logo appended at the bottom
-    - Tracking pixel that hits /track/open/{tracking_id}.png
+    Swap the pixel-bearing Sent copy for the sanitized one.
 
-    After sending:
-    - Delete the original Sent copy
-    - Insert a sanitized Sent copy without the tracking pixel
+    The delete and the insert are pipelined into a single batch HTTP request
+    instead of two sequential round-trips. Only a delete that failed because
+    Gmail has not indexed the Sent copy yet (404/409) is retried, with short
+    exponential backoff - anything else is a real error and not worth
+    sleeping on.
     """
-    sender_email = os.getenv("SENDER_EMAIL")
-    if not sender_email:
-        raise HTTPException(status_code=500, detail="SENDER_EMAIL not configured in .env")
+    delete_error = []
 
-    tracking_id = uuid.uuid4().hex
+    def _on_delete(request_id, response, exception):
+        if exception is not None:
+            delete_error.append(exception)
 
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        INSERT INTO tracked_emails (tracking_id, recipient, subject)
-        VALUES (?, ?, ?)
-        """,
-        (tracking_id, str(req.to), req.subject),
+    def _on_insert(request_id, response, exception):
+        if exception is not None:
+            logger.warning(f"Could not insert sanitized Sent copy: {exception}")
+
+    batch = service.new_batch_http_request()
+    batch.add(
+        service.users().messages().delete(userId="me", id=gmail_message_id),
+        callback=_on_delete,
     )
-    email_db_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    batch.add(
+        service.users().messages().insert(
+            userId="me",
+            body={"raw": raw_sanitized, "labelIds": ["SENT"]},
+        ),
+        callback=_on_insert,
+    )
+    batch.execute()
+
+    max_retries = 3
+    for attempt in range(max_retries):
+        if not delete_error:
+            break
+        error = delete_error[-1]
+        if not (isinstance(error, HttpError) and error.resp.status in (404, 409)):
+            break
+        delay = 0.05 * 2 ** attempt  # 50ms, 100ms, 200ms
+        logger.debug(f"Sent copy not deletable yet, retrying in {delay:.2f}s: {error}")
+        time.sleep(delay)
+        delete_error.clear()
+        try:
+            service.users().messages().delete(userId="me", id=gmail_message_id).execute()
+        except Exception as e:
+            delete_error.append(e)
+
+    if delete_error:
+        logger.warning(
+            f"Could not delete original sent message after {max_retries} attempts: {delete_error[-1]}"
+        )
+    else:
+        logger.debug("Original sent message deleted successfully")
 
-    html_with_pixel, html_sanitized = _build_email_html(tracking_id, email_db_id, req)
 
+def _do_gmail_send(
+    tracking_id: str,
+    sender_email: str,
+    to_addr: str,
+    subject: str,
+    html_with_pixel: str,
+    html_sanitized: str,
+):
+    """
+    Background half of send_tracked_email: the Gmail send, the Sent-copy
+    sanitization, and the gmail_message_id write-back. Runs off the request
+    path, so failures are logged rather than surfaced as HTTP errors.
+    """
     service = get_gmail_service()
 
     raw_with_pixel = _build_raw_message(
         from_addr=sender_email,
-        to_addr=req.to,
-        subject=req.subject,
+        to_addr=to_addr,
+        subject=subject,
         html_body=html_with_pixel,
     )
 
@@ -259,165 +509,344 @@ def send_tracked_email(req: SendTrackedEmailRequest):
         )
     except Exception as e:
         logger.error(f"Error sending tracked email via Gmail API: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Gmail send failed")
+        return
 
     gmail_message_id = sent_msg.get("id")
 
-    if gmail_message_id:
-        time.sleep(0.5)
-        
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                print(f"   🗑️  Attempting to delete original sent message (attempt {attempt + 1}/{max_retries})...")
-                service.users().messages().delete(userId="me", id=gmail_message_id).execute()
-                print(f"   ✅ Original sent message deleted successfully")
-                break
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    print(f"   ⚠️  Delete failed (attempt {attempt + 1}): {e}")
-                    print(f"   🔄 Retrying in {1 + attempt} seconds...")
-                    time.sleep(1 + attempt)  # Exponential backoff: 1s, 2s
-                else:
-                    print(f"   ❌ Could not delete original sent message after {max_retries} attempts: {e}")
-                    logger.warning(f"Could not delete original sent message after {max_retries} attempts: {e}")
-
     raw_sanitized = _build_raw_message(
         from_addr=sender_email,
-        to_addr=req.to,
-        subject=req.subject,
+        to_addr=to_addr,
+        subject=subject,
         html_body=html_sanitized,
     )
     try:
-        service.users().messages().insert(
-            userId="me",
-            body={"raw": raw_sanitized, "labelIds": ["SENT"]},
-        ).execute()
+        if gmail_message_id:
+            _replace_sent_copy(service, gmail_message_id, raw_sanitized)
+        else:
+            service.users().messages().insert(
+                userId="me",
+                body={"raw": raw_sanitized, "labelIds": ["SENT"]},
+            ).execute()
     except Exception as e:
-        logger.warning(f"Could not insert sanitized Sent copy: {e}")
+        logger.warning(f"Could not sanitize Sent copy: {e}")
 
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "UPDATE tracked_emails SET gmail_message_id = ? WHERE tracking_id = ?",
-        (gmail_message_id, tracking_id),
+    with pool.writer() as conn:
+        conn.execute(
+            "UPDATE tracked_emails SET gmail_message_id = ? WHERE tracking_id = ?",
+            (gmail_message_id, tracking_id),
+        )
+        conn.commit()
+
+
+@app.post("/tracked_email/send")
+def send_tracked_email(req: SendTrackedEmailRequest, background: BackgroundTasks):
+    """
+    Send an email via Gmail API with:
+    - Zain logo appended at the bottom
+    - Tracking pixel that hits /track/open/{tracking_id}.png
+
+    After sending:
+    - Delete the original Sent copy
+    - Insert a sanitized Sent copy without the tracking pixel
+
+    The Gmail round-trips happen in a background task; the response only
+    needs the tracking_id, which is known as soon as the row is inserted.
+    """
+    sender_email = os.getenv("SENDER_EMAIL")
+    if not sender_email:
+        raise HTTPException(status_code=500, detail="SENDER_EMAIL not configured in .env")
+
+    # 22-char urlsafe token: same 128 bits of entropy as uuid4().hex but a
+    # shorter key in the tracking_id B-tree.
+    tracking_id = secrets.token_urlsafe(16)
+
+    with pool.writer() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            INSERT INTO tracked_emails (tracking_id, recipient, subject)
+            VALUES (?, ?, ?)
+            """,
+            (tracking_id, str(req.to), req.subject),
+        )
+        email_db_id = cursor.lastrowid
+        conn.commit()
+
+    html_with_pixel, html_sanitized = _build_email_html(tracking_id, email_db_id, req)
+
+    background.add_task(
+        _do_gmail_send,
+        tracking_id,
+        sender_email,
+        str(req.to),
+        req.subject,
+        html_with_pixel,
+        html_sanitized,
     )
-    conn.commit()
-    conn.close()
 
-    return {"tracking_id": tracking_id, "gmail_message_id": gmail_message_id}
+    return {"tracking_id": tracking_id, "status": "queued"}
 
 
-def _record_open(tracking_id: str, ua: str, client_ip: str):
+def _do_gmail_send_batch(sender_email: str, entries: list[tuple[str, str, str, str, str]]):
     """
-    Record an open event in email_opens and update aggregated stats in tracked_emails.
+    Background half of send_tracked_email_batch. Each entry is
+    (tracking_id, to, subject, html_with_pixel, html_sanitized). Sends go
+    out in Gmail batch HTTP requests of up to GMAIL_MAX_BATCH; the
+    gmail_message_id write-back is one transaction for the whole batch.
     """
-    print(f"\n{'='*80}")
-    print(f"📧 EMAIL OPENED!")
-    print(f"   tracking_id: {tracking_id}")
-    print(f"   User-Agent: {ua[:100]}")
-    print(f"   IP: {client_ip}")
-    print(f"{'='*80}\n")
-    
-    now = datetime.datetime.utcnow().isoformat(sep=" ")
-    conn = get_connection()
-    cursor = conn.cursor()
+    service = get_gmail_service()
+    results: dict[str, str] = {}
+
+    def _collect(tracking_id: str):
+        def _cb(request_id, response, exception):
+            if exception is not None:
+                logger.error(f"Batch send failed for tracking_id={tracking_id}: {exception}")
+            else:
+                results[tracking_id] = response.get("id")
+        return _cb
+
+    for start in range(0, len(entries), GMAIL_MAX_BATCH):
+        batch = service.new_batch_http_request()
+        for tracking_id, to_addr, subject, html_with_pixel, _ in entries[start:start + GMAIL_MAX_BATCH]:
+            raw = _build_raw_message(
+                from_addr=sender_email,
+                to_addr=to_addr,
+                subject=subject,
+                html_body=html_with_pixel,
+            )
+            batch.add(
+                service.users().messages().send(userId="me", body={"raw": raw}),
+                callback=_collect(tracking_id),
+            )
+        try:
+            batch.execute()
+        except Exception as e:
+            logger.error(f"Gmail batch send failed: {e}", exc_info=True)
+
+    for tracking_id, to_addr, subject, _, html_sanitized in entries:
+        gmail_message_id = results.get(tracking_id)
+        if not gmail_message_id:
+            continue
+        raw_sanitized = _build_raw_message(
+            from_addr=sender_email,
+            to_addr=to_addr,
+            subject=subject,
+            html_body=html_sanitized,
+        )
+        try:
+            _replace_sent_copy(service, gmail_message_id, raw_sanitized)
+        except Exception as e:
+            logger.warning(f"Could not sanitize Sent copy for tracking_id={tracking_id}: {e}")
+
+    if results:
+        with pool.writer() as conn:
+            conn.executemany(
+                "UPDATE tracked_emails SET gmail_message_id = ? WHERE tracking_id = ?",
+                [(mid, tid) for tid, mid in results.items()],
+            )
+            conn.commit()
+
+
+@app.post("/tracked_email/send_batch")
+def send_tracked_email_batch(req: BulkSendRequest, background: BackgroundTasks):
+    """
+    Bulk variant of /tracked_email/send: all tracked_emails rows are
+    inserted in a single transaction (one fsync instead of N), and the
+    Gmail sends go out in batch HTTP requests from a background task.
+    Returns the tracking_ids in request order.
+    """
+    sender_email = os.getenv("SENDER_EMAIL")
+    if not sender_email:
+        raise HTTPException(status_code=500, detail="SENDER_EMAIL not configured in .env")
+    if not req.emails:
+        raise HTTPException(status_code=422, detail="emails must not be empty")
 
-    cursor.execute(
-        """
-        INSERT INTO email_opens (tracking_id, opened_at, user_agent, ip_address)
-        VALUES (?, ?, ?, ?)
-        """,
-        (tracking_id, now, ua, client_ip),
-    )
-    print(f"✅ Recorded open event in email_opens table")
+    tracking_ids = [secrets.token_urlsafe(16) for _ in req.emails]
 
-    # Update aggregate stats
-    cursor.execute(
-        """
-        SELECT is_read, read_at, last_read_at, read_count
-        FROM tracked_emails
-        WHERE tracking_id = ?
-        """,
-        (tracking_id,),
-    )
-    row = cursor.fetchone()
-    if row is not None:
-        is_read, read_at, last_read_at, read_count = row
-        read_count = (read_count or 0) + 1
-        if not is_read:
-            read_at = now
-            is_read = 1
-            print(f"✅ FIRST READ - Marking as read!")
-        else:
-            print(f"✅ Additional read (count now: {read_count})")
-        last_read_at = now
-        cursor.execute(
+    with pool.writer() as conn:
+        conn.executemany(
             """
-            UPDATE tracked_emails
-            SET is_read = ?, read_at = ?, last_read_at = ?, read_count = ?
-            WHERE tracking_id = ?
+            INSERT INTO tracked_emails (tracking_id, recipient, subject)
+            VALUES (?, ?, ?)
             """,
-            (is_read, read_at, last_read_at, read_count, tracking_id),
+            [
+                (tid, str(email.to), email.subject)
+                for tid, email in zip(tracking_ids, req.emails)
+            ],
+        )
+        placeholders = ",".join("?" * len(tracking_ids))
+        id_map = dict(
+            conn.execute(
+                f"SELECT tracking_id, id FROM tracked_emails WHERE tracking_id IN ({placeholders})",
+                tracking_ids,
+            ).fetchall()
         )
-        print(f"✅ Updated tracked_emails: is_read={is_read}, read_count={read_count}")
+        conn.commit()
+
+    entries = []
+    for tid, email in zip(tracking_ids, req.emails):
+        html_with_pixel, html_sanitized = _build_email_html(tid, id_map[tid], email)
+        entries.append((tid, str(email.to), email.subject, html_with_pixel, html_sanitized))
+
+    background.add_task(_do_gmail_send_batch, sender_email, entries)
+
+    return {"tracking_ids": tracking_ids, "status": "queued"}
+
+
+# Group-commit window for open events: the writer task drains up to
+# _OPEN_BATCH_MAX queued opens (or waits _OPEN_BATCH_WAIT for more) and
+# flushes them in one transaction, amortizing the WAL fsync over the batch.
+_OPEN_BATCH_MAX = 64
+_OPEN_BATCH_WAIT = 0.010
+
+_open_queue: Optional[asyncio.Queue] = None
+_open_writer_task: Optional[asyncio.Task] = None
+
+
+def _flush_opens(batch: list) -> dict:
+    """
+    Write a batch of queued open events in a single transaction.
+    Each batch item is (tracking_id, now, ua, client_ip, future).
+    Returns {tracking_id: read_count} for the rows that exist.
+    """
+    # Coalesce the aggregate bump per tracking_id: count, first and last
+    # timestamp (items arrive in queue order, so timestamps are ascending).
+    agg: dict[str, list] = {}
+    for tracking_id, now, _, _, _ in batch:
+        entry = agg.get(tracking_id)
+        if entry is None:
+            agg[tracking_id] = [1, now, now]
+        else:
+            entry[0] += 1
+            entry[2] = now
+
+    counts: dict[str, int] = {}
+    with pool.writer() as conn:
+        cursor = conn.cursor()
+
+        # BEGIN IMMEDIATE takes the write lock up front, avoiding the
+        # SQLITE_BUSY lock-upgrade race between concurrent flushes.
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.executemany(
+            SQL_INSERT_OPEN,
+            [(tid, now, ua, ip) for tid, now, ua, ip, _ in batch],
+        )
+
+        # Single atomic read-count bump per email: COALESCE keeps the first
+        # read_at, RETURNING gives us the new stats without a second SELECT.
+        for tracking_id, (count, first_now, last_now) in agg.items():
+            cursor.execute(
+                SQL_UPDATE_TRACKED,
+                (count, last_now, first_now, tracking_id),
+            )
+            row = cursor.fetchone()
+            if row is not None:
+                counts[tracking_id] = row[0]
+        conn.commit()
+    return counts
+
+
+async def _open_writer_loop():
+    """Drain queued open events and group-commit them."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _open_queue.get()]
+        deadline = loop.time() + _OPEN_BATCH_WAIT
+        while len(batch) < _OPEN_BATCH_MAX:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_open_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        try:
+            counts = await anyio.to_thread.run_sync(_flush_opens, batch)
+        except Exception as e:
+            logger.error(f"Failed to flush {len(batch)} open events: {e}", exc_info=True)
+            counts = {}
+        for *_, future in batch:
+            if not future.done():
+                future.set_result(counts)
+
+
+async def _record_open(tracking_id: str, ua: str, client_ip: str):
+    """
+    Record an open event in email_opens and update aggregated stats in
+    tracked_emails. The write is pushed onto the group-commit queue and
+    awaited, so concurrent opens share one transaction and one fsync.
+    """
+    logger.debug(f"Email opened: tracking_id={tracking_id} ip={client_ip} ua={ua[:100]}")
+
+    # Epoch-ms integer: no timezone math or string formatting per hit, and
+    # a smaller value in the row than an ISO string. /status renders it as
+    # ISO on the way out.
+    now = time.time_ns() // 1_000_000
+    future = asyncio.get_running_loop().create_future()
+    await _open_queue.put((tracking_id, now, ua, client_ip, future))
+    counts = await future
+
+    read_count = counts.get(tracking_id)
+    if read_count is not None:
+        logger.debug(f"Updated tracked_emails: tracking_id={tracking_id} read_count={read_count}")
     else:
-        print(f"⚠️  WARNING: No tracked_emails row found for tracking_id={tracking_id}")
+        logger.warning(f"No tracked_emails row found for tracking_id={tracking_id}")
 
-    conn.commit()
-    conn.close()
-    print(f"{'='*80}\n")
+
+# Logo bytes served on every pixel hit, fetched from the upstream CDN once
+# at startup instead of proxied (or TTL-cached) per request. Until the
+# startup fetch lands - or if it fails - a 1x1 transparent GIF is served.
+_FALLBACK_GIF = base64.b64decode(
+    "R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7"
+)
+_logo_bytes = _FALLBACK_GIF
+_logo_content_type = "image/gif"
+
+NO_CACHE_HEADERS = {
+    "Cache-Control": "no-store, no-cache, must-revalidate, proxy-revalidate, max-age=0",
+    "Pragma": "no-cache",
+    "Expires": "0",
+    "Content-Disposition": "inline",
+    "Vary": "User-Agent, Accept",
+    "X-Robots-Tag": "noindex, nofollow",
+}
+
+
+@app.on_event("startup")
+async def _startup_fetch_logo():
+    global _logo_bytes, _logo_content_type
+    try:
+        r = await app.state.http.get(STATIC_LOGO_URL)
+        r.raise_for_status()
+        _logo_bytes = r.content
+        _logo_content_type = r.headers.get("Content-Type", "image/png")
+        logger.info(f"Logo fetched at startup: {len(_logo_bytes)} bytes, {_logo_content_type}")
+    except Exception as e:
+        logger.warning(f"Could not fetch logo at startup, serving fallback 1x1 GIF: {e}")
 
 
-def _proxy_logo_response() -> Response:
+def _logo_response() -> Response:
     """
-    Return the actual logo image with aggressive no-cache headers.
+    Return the logo image with aggressive no-cache headers.
     This is what gets loaded when the email is opened - a visible logo that tracks.
-    
+
     Cache-busting strategy:
     - Each email has unique query params (timestamp in ms + nonce)
     - Strong no-cache headers prevent Gmail proxy from caching
     - Vary header forces fresh request for different query params
     """
-    logo_url = os.getenv("TRACKING_LOGO_URL", DEFAULT_LOGO_URL)
-    
-    try:
-        print(f"   📥 Fetching logo from: {logo_url[:80]}...")
-        r = requests.get(logo_url, timeout=5)
-        r.raise_for_status()
-        content_type = r.headers.get("Content-Type", "image/png")
-        print(f"   ✅ Logo fetched successfully ({len(r.content)} bytes, {content_type})")
-        
-        return Response(
-            content=r.content,
-            media_type=content_type,
-            headers={
-                "Cache-Control": "no-store, no-cache, must-revalidate, proxy-revalidate, max-age=0",
-                "Pragma": "no-cache",
-                "Expires": "0",
-                "Content-Disposition": "inline",
-                "Vary": "User-Agent, Accept",  
-                "X-Robots-Tag": "noindex, nofollow",  
-            },
-        )
-    except Exception as e:
-        print(f"   ⚠️  Error fetching logo: {e}")
-        print(f"   📤 Returning fallback 1x1 transparent GIF")
-        transparent_gif = base64.b64decode(
-            "R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7"
-        )
-        return Response(
-            content=transparent_gif,
-            media_type="image/gif",
-            headers={
-                "Cache-Control": "no-store, no-cache, must-revalidate, proxy-revalidate, max-age=0",
-                "Pragma": "no-cache",
-                "Expires": "0",
-                "Content-Disposition": "inline",
-                "Vary": "User-Agent, Accept",
-                "X-Robots-Tag": "noindex, nofollow",
-            },
-        )
+    return Response(
+        content=_logo_bytes,
+        media_type=_logo_content_type,
+        headers=NO_CACHE_HEADERS,
+    )
+
+
+def _lookup_tracking_id(email_db_id: int) -> Optional[str]:
+    with pool.reader() as conn:
+        row = conn.execute(SQL_SELECT_TID_BY_EID, (email_db_id,)).fetchone()
+    return row[0] if row else None
 
 
 @app.get("/app/v1/bulkemail/email-read-receipt/")
@@ -433,28 +862,25 @@ async def email_read_receipt(request: Request):
     ua = request.headers.get("User-Agent", "")
     client_ip = request.client.host if request.client else ""
     
-    print(f"\n🔔 READ RECEIPT HIT: eid={eid}, t={tracking_id[:16] if tracking_id else None}..., IP={client_ip}")
-    print(f"   User-Agent: {ua[:100]}")
+    logger.debug(
+        f"Read receipt hit: eid={eid}, t={tracking_id[:16] if tracking_id else None}..., "
+        f"ip={client_ip}, ua={ua[:100]}"
+    )
 
     if eid and eid.isdigit():
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT tracking_id FROM tracked_emails WHERE id = ?",
-            (int(eid),),
-        )
-        row = cursor.fetchone()
-        conn.close()
-        if row:
-            tracking_id = row[0]
-            print(f"   ✅ Found tracking_id from eid={eid}: {tracking_id}")
+        # Borrowing a reader can block on queue.get() and the query itself
+        # is synchronous sqlite - keep both off the event loop.
+        found = await anyio.to_thread.run_sync(_lookup_tracking_id, int(eid))
+        if found:
+            tracking_id = found
+            logger.debug(f"Found tracking_id from eid={eid}: {tracking_id}")
 
     if tracking_id:
-        _record_open(tracking_id, ua, client_ip)
+        await _record_open(tracking_id, ua, client_ip)
     else:
-        print(f"   ⚠️  No tracking_id found - skipping record")
+        logger.debug("No tracking_id found - skipping record")
 
-    return _proxy_logo_response()
+    return _logo_response()
 
 
 @app.get("/track/open/{tracking_id}.png")
@@ -465,25 +891,44 @@ async def track_open(tracking_id: str, request: Request):
     """
     ua = request.headers.get("User-Agent", "")
     client_ip = request.client.host if request.client else ""
-    _record_open(tracking_id, ua, client_ip)
-    return _proxy_logo_response()
+    await _record_open(tracking_id, ua, client_ip)
+    return _logo_response()
+
+
+def _timestamp_to_iso(value):
+    """
+    Render stored timestamps for API output. New rows hold epoch-ms
+    integers; rows written before the switch hold ISO text and pass
+    through unchanged.
+    """
+    if isinstance(value, int):
+        return datetime.datetime.utcfromtimestamp(value / 1000).isoformat(sep=" ")
+    return value
 
 
 @app.get("/status")
 def status():
     """Quick status check showing recent tracked emails and their read status."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT id, tracking_id, recipient, subject, is_read, read_count, 
-               sent_at, read_at, last_read_at
-        FROM tracked_emails
-        ORDER BY id DESC
-        LIMIT 10
-        """
-    )
-    rows = cursor.fetchall()
+    with pool.reader() as conn:
+        cursor = conn.cursor()
+        # One round-trip: the opens total rides along as a scalar subquery
+        # instead of a second SELECT.
+        cursor.execute(
+            """
+            SELECT id, tracking_id, recipient, subject, is_read, read_count,
+                   sent_at, read_at, last_read_at,
+                   (SELECT COUNT(*) FROM email_opens) AS total_opens
+            FROM tracked_emails
+            ORDER BY id DESC
+            LIMIT 10
+            """
+        )
+        rows = cursor.fetchall()
+        if rows:
+            total_opens = rows[0][9]
+        else:
+            total_opens = cursor.execute("SELECT COUNT(*) FROM email_opens").fetchone()[0]
+
     emails = []
     for row in rows:
         emails.append({
@@ -494,15 +939,10 @@ def status():
             "is_read": bool(row[4]),
             "read_count": row[5] or 0,
             "sent_at": row[6],
-            "read_at": row[7],
-            "last_read_at": row[8],
+            "read_at": _timestamp_to_iso(row[7]),
+            "last_read_at": _timestamp_to_iso(row[8]),
         })
-    
-    cursor.execute("SELECT COUNT(*) FROM email_opens")
-    total_opens = cursor.fetchone()[0]
-    
-    conn.close()
-    
+
     return {
         "status": "running",
         "tracking_base_url": os.getenv("TRACKING_BASE_URL", "NOT SET"),